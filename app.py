@@ -1,99 +1,33 @@
 # app.py
-import math
 import numpy as np
 import streamlit as st
 import plotly.graph_objects as go
+import plotly.io as pio
 
-# -----------------------------
-# Math helpers (no scipy needed)
-# -----------------------------
-def norm_cdf(x: float) -> float:
-    return 0.5 * (1.0 + math.erf(x / math.sqrt(2.0)))
-
-def norm_pdf(x: float) -> float:
-    """Standard normal probability density function"""
-    return (1.0 / math.sqrt(2.0 * math.pi)) * math.exp(-0.5 * x * x)
-
-def black_scholes_price(S: float, K: float, T: float, sigma: float, r: float, option_type: str) -> float:
-    """
-    Black-Scholes (no dividends).
-    S: spot
-    K: strike
-    T: time to maturity in years
-    sigma: volatility (decimal, e.g. 0.2)
-    r: risk-free rate (decimal, e.g. 0.03)
-    option_type: 'Call' or 'Put'
-    """
-    if T <= 0:
-        # Expired: intrinsic value
-        if option_type == "Call":
-            return max(S - K, 0.0)
-        return max(K - S, 0.0)
-
-    if sigma <= 0:
-        # Zero vol: discounted intrinsic at expiry approximation
-        forward = S * math.exp(r * T)
-        if option_type == "Call":
-            return math.exp(-r * T) * max(forward - K, 0.0)
-        return math.exp(-r * T) * max(K - forward, 0.0)
-
-    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
+from pricing import (
+    black_scholes_price,
+    build_price_surface,
+    calculate_greeks_vec,
+    greeks_surface,
+    price_and_greeks,
+    calculate_payoff_vec,
+)
 
-    if option_type == "Call":
-        return S * norm_cdf(d1) - K * math.exp(-r * T) * norm_cdf(d2)
-    else:
-        return K * math.exp(-r * T) * norm_cdf(-d2) - S * norm_cdf(-d1)
-
-def calculate_greeks(S: float, K: float, T: float, sigma: float, r: float, option_type: str) -> dict:
-    """Calculate option Greeks: Delta, Gamma, Theta, Vega"""
-    if T <= 0 or sigma <= 0:
-        return {"delta": 0.0, "gamma": 0.0, "theta": 0.0, "vega": 0.0}
-    
-    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
-    d2 = d1 - sigma * math.sqrt(T)
-    
-    # Delta
-    if option_type == "Call":
-        delta = norm_cdf(d1)
-    else:
-        delta = norm_cdf(d1) - 1.0
-    
-    # Gamma (same for Call and Put)
-    gamma = norm_pdf(d1) / (S * sigma * math.sqrt(T))
-    
-    # Theta (per year, negative for time decay)
-    if option_type == "Call":
-        theta = (-S * norm_pdf(d1) * sigma / (2 * math.sqrt(T)) 
-                 - r * K * math.exp(-r * T) * norm_cdf(d2)) / 365.0
-    else:
-        theta = (-S * norm_pdf(d1) * sigma / (2 * math.sqrt(T)) 
-                 + r * K * math.exp(-r * T) * norm_cdf(-d2)) / 365.0
-    
-    # Vega (same for Call and Put, per 1% vol change)
-    vega = S * norm_pdf(d1) * math.sqrt(T) / 100.0
-    
-    return {
-        "delta": delta,
-        "gamma": gamma,
-        "theta": theta,
-        "vega": vega
-    }
-
-def calculate_payoff(S: float, K: float, option_type: str, premium: float = 0.0) -> float:
-    """Calculate profit/loss at expiration"""
-    if option_type == "Call":
-        intrinsic = max(S - K, 0.0)
-    else:
-        intrinsic = max(K - S, 0.0)
-    return intrinsic - premium
+# Plotly sends numpy arrays to the browser as base64 typed arrays; orjson
+# serializes the rest of the figure faster when it is installed
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
 
 # -----------------------------
 # Custom CSS Styling
 # -----------------------------
-def inject_custom_css():
-    """Inject custom CSS matching the portfolio design system"""
-    custom_css = """
+# Bump when editing _CUSTOM_CSS: the cache below keys on it, not on the string
+_CSS_VERSION = 1
+
+_CUSTOM_CSS = """
     <style>
     /* Import Inter font */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800&display=swap');
@@ -794,18 +728,24 @@ def inject_custom_css():
     }
     </style>
     """
-    st.markdown(custom_css, unsafe_allow_html=True)
 
-# -----------------------------
-# Streamlit UI
-# -----------------------------
-st.set_page_config(page_title="Options Price • 3D Analysis (Black–Scholes)", layout="wide")
+@st.cache_resource
+def _get_css(version: int) -> str:
+    # cache_resource: one shared string per process instead of a per-session copy
+    return _CUSTOM_CSS
 
-# Inject custom CSS
-inject_custom_css()
+def inject_custom_css():
+    """Inject custom CSS matching the portfolio design system"""
+    # Re-sent on every rerun: Streamlit drops elements a rerun doesn't emit,
+    # so injecting only once per session would unstyle the page
+    st.markdown(_get_css(_CSS_VERSION), unsafe_allow_html=True)
 
-# Header with gradient effect
-st.markdown("""
+# -----------------------------
+# Static HTML blocks
+# -----------------------------
+@st.cache_data
+def _header_html() -> str:
+    return """
     <div style="text-align: center; margin-bottom: 3rem;">
         <h1 style="background: linear-gradient(135deg, #f5f5f0 0%, #39ff14 100%);
                     -webkit-background-clip: text;
@@ -821,10 +761,12 @@ st.markdown("""
             3D Visualization & Greeks Analysis
         </p>
     </div>
-""", unsafe_allow_html=True)
+"""
 
-# Black-Scholes Formula Explanation Section
-st.markdown("""
+@st.cache_data
+def _section_title_html(title: str) -> str:
+    """Glass card with a centered section heading"""
+    return f"""
     <div style="background: rgba(18, 53, 19, 0.3);
                 backdrop-filter: blur(20px);
                 border: 1px solid rgba(57, 255, 20, 0.3);
@@ -838,40 +780,41 @@ st.markdown("""
                    margin-bottom: 1.5rem;
                    text-align: center;
                    font-size: clamp(1.2rem, 4vw, 1.8rem);">
-            The Black-Scholes Formula
+            {title}
         </h2>
     </div>
-""", unsafe_allow_html=True)
+"""
 
-# Formulas Section
-col_form1, col_form2 = st.columns(2)
-
-with col_form1:
-    st.markdown("""
+@st.cache_data
+def _formula_label_html(label: str) -> str:
+    return f"""
         <div style="background: rgba(0, 0, 0, 0.3);
                     border-radius: 15px;
                     padding: clamp(1rem, 2.5vw, 1.5rem);
                     margin-bottom: 1rem;
                     border: 1px solid rgba(57, 255, 20, 0.2);">
-            <h3 style="color: #f5f5f0; font-weight: 600; margin-bottom: 0.5rem; font-size: clamp(1rem, 3vw, 1.2rem);">Call Option Price:</h3>
+            <h3 style="color: #f5f5f0; font-weight: 600; margin-bottom: 0.5rem; font-size: clamp(1rem, 3vw, 1.2rem);">{label}</h3>
         </div>
-    """, unsafe_allow_html=True)
-    st.latex(r"C = S_0 N(d_1) - K e^{-rT} N(d_2)")
+    """
 
-with col_form2:
-    st.markdown("""
-        <div style="background: rgba(0, 0, 0, 0.3);
-                    border-radius: 15px;
-                    padding: clamp(1rem, 2.5vw, 1.5rem);
-                    margin-bottom: 1rem;
-                    border: 1px solid rgba(57, 255, 20, 0.2);">
-            <h3 style="color: #f5f5f0; font-weight: 600; margin-bottom: 0.5rem; font-size: clamp(1rem, 3vw, 1.2rem);">Put Option Price:</h3>
+@st.cache_data
+def _variable_card_html(symbol: str, name: str, description: str) -> str:
+    return f"""
+        <div style="background: rgba(255, 255, 255, 0.05);
+                    backdrop-filter: blur(10px);
+                    border: 1px solid rgba(255, 255, 255, 0.1);
+                    border-radius: 12px;
+                    padding: clamp(0.8rem, 2vw, 1.2rem);
+                    margin-bottom: 1rem;">
+            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">{symbol}</div>
+            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">{name}</div>
+            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">{description}</div>
         </div>
-    """, unsafe_allow_html=True)
-    st.latex(r"P = K e^{-rT} N(-d_2) - S_0 N(-d_1)")
+    """
 
-# Where section
-st.markdown("""
+@st.cache_data
+def _where_html() -> str:
+    return """
     <div style="background: rgba(0, 0, 0, 0.3);
                 border-radius: 15px;
                 padding: clamp(1rem, 2.5vw, 1.5rem);
@@ -880,16 +823,11 @@ st.markdown("""
                 border: 1px solid rgba(57, 255, 20, 0.2);">
         <h4 style="color: #39ff14; font-weight: 600; margin-bottom: 0.5rem; font-size: clamp(0.9rem, 2.5vw, 1.1rem);">Where:</h4>
     </div>
-""", unsafe_allow_html=True)
-
-st.latex(r"d_1 = \frac{\ln(S_0/K) + (r + \sigma^2/2)T}{\sigma\sqrt{T}}")
-st.latex(r"d_2 = d_1 - \sigma\sqrt{T}")
-
-# Spacer
-st.markdown('<div style="height: 2rem;"></div>', unsafe_allow_html=True)
+"""
 
-# Variable explanations in columns to ensure proper rendering
-st.markdown("""
+@st.cache_data
+def _variable_heading_html() -> str:
+    return """
     <h3 style="color: #39ff14; 
                font-weight: 700; 
                text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
@@ -898,94 +836,11 @@ st.markdown("""
                font-size: clamp(1rem, 3vw, 1.3rem);">
         Variable Explanations
     </h3>
-""", unsafe_allow_html=True)
-
-# Use Streamlit columns for variable cards
-var_col1, var_col2, var_col3 = st.columns(3)
+"""
 
-with var_col1:
-    st.markdown("""
-        <div style="background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: clamp(0.8rem, 2vw, 1.2rem);
-                    margin-bottom: 1rem;">
-            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">S₀</div>
-            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">Current Asset Price</div>
-            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">The current market price of the underlying asset</div>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-        <div style="background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: clamp(0.8rem, 2vw, 1.2rem);
-                    margin-bottom: 1rem;">
-            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">K</div>
-            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">Strike Price</div>
-            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">The price at which the option can be exercised</div>
-        </div>
-    """, unsafe_allow_html=True)
-
-with var_col2:
-    st.markdown("""
-        <div style="background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: clamp(0.8rem, 2vw, 1.2rem);
-                    margin-bottom: 1rem;">
-            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">T</div>
-            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">Time to Maturity</div>
-            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">Time remaining until option expiration (in years)</div>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-        <div style="background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: clamp(0.8rem, 2vw, 1.2rem);
-                    margin-bottom: 1rem;">
-            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">σ (sigma)</div>
-            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">Volatility</div>
-            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">Annualized standard deviation of asset returns (as decimal, e.g., 0.2 = 20%)</div>
-        </div>
-    """, unsafe_allow_html=True)
-
-with var_col3:
-    st.markdown("""
-        <div style="background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: clamp(0.8rem, 2vw, 1.2rem);
-                    margin-bottom: 1rem;">
-            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">r</div>
-            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">Risk-Free Rate</div>
-            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">Annual risk-free interest rate (as decimal, e.g., 0.03 = 3%)</div>
-        </div>
-    """, unsafe_allow_html=True)
-    
-    st.markdown("""
-        <div style="background: rgba(255, 255, 255, 0.05);
-                    backdrop-filter: blur(10px);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 12px;
-                    padding: clamp(0.8rem, 2vw, 1.2rem);
-                    margin-bottom: 1rem;">
-            <div style="color: #39ff14; font-weight: 700; font-size: clamp(1rem, 2.5vw, 1.2rem); margin-bottom: 0.5rem;">N(·)</div>
-            <div style="color: #b8b8a8; font-size: clamp(0.85rem, 2vw, 0.95rem); margin-bottom: 0.5rem;">Cumulative Distribution</div>
-            <div style="color: #808070; font-size: clamp(0.75rem, 1.8vw, 0.85rem);">Standard normal cumulative distribution function</div>
-        </div>
-    """, unsafe_allow_html=True)
-
-# Model Assumptions
-st.markdown("""
+@st.cache_data
+def _assumptions_html() -> str:
+    return """
     <div style="margin-top: 1.5rem; padding: clamp(0.8rem, 2vw, 1.2rem); 
                 background: rgba(18, 53, 19, 0.4);
                 border-radius: 12px;
@@ -1001,33 +856,142 @@ st.markdown("""
             <li>Continuous trading is possible</li>
         </ul>
     </div>
-""", unsafe_allow_html=True)
+"""
 
-# Input Parameters Section
-st.markdown("""
-    <div style="background: rgba(18, 53, 19, 0.3);
-                backdrop-filter: blur(20px);
-                border: 1px solid rgba(57, 255, 20, 0.3);
-                border-radius: 20px;
-                padding: clamp(1rem, 3vw, 2rem);
-                margin-bottom: 2rem;
-                box-shadow: 0 0 30px rgba(57, 255, 20, 0.2);">
-        <h2 style="color: #39ff14; 
-                   font-weight: 700; 
-                   text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
-                   margin-bottom: 1.5rem;
-                   text-align: center;
-                   font-size: clamp(1.2rem, 4vw, 1.8rem);">
-            Input Parameters
-        </h2>
-    </div>
-""", unsafe_allow_html=True)
+# Variable cards, one inner list per st.columns column
+_VARIABLE_CARDS = [
+    [("S₀", "Current Asset Price", "The current market price of the underlying asset"),
+     ("K", "Strike Price", "The price at which the option can be exercised")],
+    [("T", "Time to Maturity", "Time remaining until option expiration (in years)"),
+     ("σ (sigma)", "Volatility", "Annualized standard deviation of asset returns (as decimal, e.g., 0.2 = 20%)")],
+    [("r", "Risk-Free Rate", "Annual risk-free interest rate (as decimal, e.g., 0.03 = 3%)"),
+     ("N(·)", "Cumulative Distribution", "Standard normal cumulative distribution function")],
+]
+
+def _join_html(*blocks: str) -> str:
+    # No blank lines between blocks: markdown would end the HTML block there
+    # and render the next indented <div> as a code block
+    return "\n".join(block.strip() for block in blocks)
+
+@st.cache_data
+def _intro_html() -> str:
+    return _join_html(_header_html(), _section_title_html("The Black-Scholes Formula"))
+
+@st.cache_data
+def _variables_intro_html() -> str:
+    return _join_html('<div style="height: 2rem;"></div>', _variable_heading_html())
+
+@st.cache_data
+def _variable_column_html(index: int) -> str:
+    """Both cards of one variable column as a single markdown element"""
+    return _join_html(*(_variable_card_html(*card) for card in _VARIABLE_CARDS[index]))
+
+@st.cache_data
+def _assumptions_and_inputs_html() -> str:
+    return _join_html(_assumptions_html(), _section_title_html("Input Parameters"))
+
+# -----------------------------
+# Cached computations
+# -----------------------------
+# Builders take only scalars, so st.cache_data hashes them cheaply and any
+# rerun with unchanged inputs (tab switch, unrelated widget) skips the math.
+# Curves are returned as float32: they are only drawn, and it halves the
+# payload sent to the browser.
+def compute_price_surface(S_min: float, S_max: float, v_min: float, v_max: float, ns: int, nv: int,
+                          K: float, T: float, r: float, is_call: int) -> tuple:
+    """
+    Spot axis, vol axis and the price surface Z[i, j] at (S_axis[i], sigma_axis[j]), all float32.
+    Not cached itself: compute_surface_trace caches it on the same arguments.
+    """
+    # Display-only grid: float32 end to end, no float64 copies on the way to the kernel
+    S_axis = np.linspace(S_min, S_max, ns, dtype=np.float32)
+    sigma_axis = np.linspace(v_min, v_max, nv, dtype=np.float32)
+    return S_axis, sigma_axis, build_price_surface(S_axis, sigma_axis, K, T, r, is_call)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_surface_trace(S_min: float, S_max: float, v_min: float, v_max: float, ns: int, nv: int,
+                          K: float, T: float, r: float, is_call: int) -> dict:
+    """go.Surface for the price surface, as a plain trace dict"""
+    S_vals, vol_vals, Z = compute_price_surface(S_min, S_max, v_min, v_max, ns, nv, K, T, r, is_call)
+    # Plotly spans the grid from 1-D axes, so no meshes are built or sent;
+    # it wants z[j][i] at (x[i], y[j]), i.e. rows along vol, hence Z.T
+    return go.Surface(
+        x=S_vals,
+        y=vol_vals,
+        z=np.ascontiguousarray(Z.T),
+        colorscale="Viridis",
+        colorbar={"title": "Option Price ($)"},
+        hovertemplate="Spot: $%{x:.2f}<br>Vol: %{y:.2%}<br>Price: $%{z:.4f}<extra></extra>",
+    ).to_plotly_json()
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_greek_curves_S(S_min: float, S_max: float, n: int, K: float, T: float, sigma: float, r: float,
+                           is_call: int) -> tuple:
+    """Spot axis and all four Greeks along it from one kernel pass"""
+    S_axis = np.linspace(S_min, S_max, n, dtype=np.float32)
+    greeks = greeks_surface(S_axis, sigma, K, T, r, is_call)
+    return S_axis, {name: g.astype(np.float32) for name, g in greeks.items()}
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_theta_curve(T: float, S0: float, K: float, sigma: float, r: float, is_call: int) -> tuple:
+    """Time-to-expiry axis (up to 1.5x T) and Theta along it"""
+    time_remaining = np.linspace(0.01, T * 1.5, 100)
+    thetas = calculate_greeks_vec(S0, K, time_remaining, sigma, r, is_call)["theta"]
+    return time_remaining.astype(np.float32), thetas.astype(np.float32)
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def compute_vega_curve(v_min: float, v_max: float, n: int, S0: float, K: float, T: float, r: float,
+                       is_call: int) -> tuple:
+    """Volatility axis and Vega along it"""
+    vol_axis = np.linspace(v_min, v_max, n, dtype=np.float32)
+    return vol_axis, greeks_surface(S0, vol_axis, K, T, r, is_call)["vega"].astype(np.float32)
+
+# -----------------------------
+# Streamlit UI
+# -----------------------------
+st.set_page_config(page_title="Options Price • 3D Analysis (Black–Scholes)", layout="wide")
+
+# Inject custom CSS
+inject_custom_css()
+
+# Header with gradient effect and the Black-Scholes Formula section title
+st.markdown(_intro_html(), unsafe_allow_html=True)
+
+# Formulas Section
+col_form1, col_form2 = st.columns(2)
+
+with col_form1:
+    st.markdown(_formula_label_html("Call Option Price:"), unsafe_allow_html=True)
+    st.latex(r"C = S_0 N(d_1) - K e^{-rT} N(d_2)")
+
+with col_form2:
+    st.markdown(_formula_label_html("Put Option Price:"), unsafe_allow_html=True)
+    st.latex(r"P = K e^{-rT} N(-d_2) - S_0 N(-d_1)")
+
+# Where section
+st.markdown(_where_html(), unsafe_allow_html=True)
+
+st.latex(r"d_1 = \frac{\ln(S_0/K) + (r + \sigma^2/2)T}{\sigma\sqrt{T}}")
+st.latex(r"d_2 = d_1 - \sigma\sqrt{T}")
+
+# Variable explanations; the cards stay in st.columns so they keep the
+# .stColumn panel styling and the 1024px stacking rule
+st.markdown(_variables_intro_html(), unsafe_allow_html=True)
+
+for index, var_col in enumerate(st.columns(3)):
+    with var_col:
+        st.markdown(_variable_column_html(index), unsafe_allow_html=True)
+
+# Model Assumptions and the Input Parameters title
+st.markdown(_assumptions_and_inputs_html(), unsafe_allow_html=True)
 
 # Input fields in columns - styled via CSS
 col1, col2, col3 = st.columns(3, gap="medium")
 
 with col1:
     option_type = st.selectbox("Option Type", ["Call", "Put"], index=0)
+    # Pricing functions take an int flag; the string is only used for labels
+    is_call = 1 if option_type == "Call" else 0
     S0 = st.number_input("Current Asset Price (S₀)", min_value=0.0001, value=100.0, step=1.0, format="%.4f")
     K = st.number_input("Strike Price (K)", min_value=0.0001, value=100.0, step=1.0, format="%.4f")
 
@@ -1062,450 +1026,423 @@ if K <= 0:
 if S0 <= 0:
     errors.append("Spot must be > 0.")
 
-# Main content tabs
-tab1, tab2, tab3 = st.tabs(["3D Surface & Price Analysis", "Payoff Diagram", "Greeks Analysis"])
+# Main content tabs. They track which one is open and rerun on a switch, so
+# only the visible tab's body (and its pricing work) runs on each rerun
+tab1, tab2, tab3 = st.tabs(["3D Surface & Price Analysis", "Payoff Diagram", "Greeks Analysis"],
+                           on_change="rerun")
 
-with tab1:
-    colA, colB = st.columns([1, 2], vertical_alignment="top")
-    
-    with colA:
-        st.markdown("""
-            <h3 style="color: #39ff14; 
-                       font-weight: 700; 
-                       text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
-                       margin-bottom: 1rem;">
-                Current Option Metrics
-            </h3>
-        """, unsafe_allow_html=True)
+if tab1.open:
+    with tab1:
+        colA, colB = st.columns([1, 2], vertical_alignment="top")
         
-        if errors:
-            for e in errors:
-                st.error(e)
-        else:
-            price = black_scholes_price(S0, K, T, sigma, r, option_type)
-            greeks = calculate_greeks(S0, K, T, sigma, r, option_type)
-            
-            # Custom styled metric
-            st.markdown(f"""
-                <div style="background: rgba(18, 53, 19, 0.3);
-                            backdrop-filter: blur(20px);
-                            border: 1px solid rgba(57, 255, 20, 0.3);
-                            border-radius: 15px;
-                            padding: 1.5rem;
-                            margin-bottom: 1rem;
-                            box-shadow: 0 0 20px rgba(57, 255, 20, 0.2);">
-                    <div style="color: #b8b8a8; font-size: 0.9rem; margin-bottom: 0.5rem;">Option Price</div>
-                    <div style="color: #39ff14; font-size: 2rem; font-weight: 700; text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);">
-                        ${price:.4f}
-                    </div>
-                </div>
-            """, unsafe_allow_html=True)
-            
+        with colA:
             st.markdown("""
-                <div style="height: 1px; 
-                            background: linear-gradient(90deg, transparent, rgba(57, 255, 20, 0.3), transparent);
-                            margin: 1.5rem 0;"></div>
-            """, unsafe_allow_html=True)
-            
-            st.markdown("""
-                <h4 style="color: #39ff14; 
-                           font-weight: 600; 
+                <h3 style="color: #39ff14; 
+                           font-weight: 700; 
+                           text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
                            margin-bottom: 1rem;">
-                    Greeks
-                </h4>
+                    Current Option Metrics
+                </h3>
             """, unsafe_allow_html=True)
             
-            # Styled Greeks metrics
-            greeks_html = f"""
-            <div style="display: grid; gap: 0.75rem;">
-                <div style="background: rgba(255, 255, 255, 0.05);
-                            backdrop-filter: blur(10px);
-                            border: 1px solid rgba(255, 255, 255, 0.1);
-                            border-radius: 12px;
-                            padding: 1rem;
-                            transition: all 0.3s ease;">
-                    <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Delta (Δ)</div>
-                    <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">{greeks['delta']:.4f}</div>
-                    <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Price sensitivity</div>
-                </div>
-                <div style="background: rgba(255, 255, 255, 0.05);
-                            backdrop-filter: blur(10px);
-                            border: 1px solid rgba(255, 255, 255, 0.1);
-                            border-radius: 12px;
-                            padding: 1rem;">
-                    <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Gamma (Γ)</div>
-                    <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">{greeks['gamma']:.6f}</div>
-                    <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Delta sensitivity</div>
-                </div>
-                <div style="background: rgba(255, 255, 255, 0.05);
-                            backdrop-filter: blur(10px);
-                            border: 1px solid rgba(255, 255, 255, 0.1);
-                            border-radius: 12px;
-                            padding: 1rem;">
-                    <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Theta (Θ)</div>
-                    <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">${greeks['theta']:.4f}/day</div>
-                    <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Time decay</div>
-                </div>
-                <div style="background: rgba(255, 255, 255, 0.05);
-                            backdrop-filter: blur(10px);
-                            border: 1px solid rgba(255, 255, 255, 0.1);
-                            border-radius: 12px;
-                            padding: 1rem;">
-                    <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Vega (ν)</div>
-                    <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">${greeks['vega']:.4f}/1%</div>
-                    <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Volatility sensitivity</div>
+            if errors:
+                for e in errors:
+                    st.error(e)
+            else:
+                greeks = price_and_greeks(S0, K, T, sigma, r, is_call)
+                price = greeks["price"]
+                
+                # Custom styled metric
+                st.markdown(f"""
+                    <div style="background: rgba(18, 53, 19, 0.3);
+                                backdrop-filter: blur(20px);
+                                border: 1px solid rgba(57, 255, 20, 0.3);
+                                border-radius: 15px;
+                                padding: 1.5rem;
+                                margin-bottom: 1rem;
+                                box-shadow: 0 0 20px rgba(57, 255, 20, 0.2);">
+                        <div style="color: #b8b8a8; font-size: 0.9rem; margin-bottom: 0.5rem;">Option Price</div>
+                        <div style="color: #39ff14; font-size: 2rem; font-weight: 700; text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);">
+                            ${price:.4f}
+                        </div>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                st.markdown("""
+                    <div style="height: 1px; 
+                                background: linear-gradient(90deg, transparent, rgba(57, 255, 20, 0.3), transparent);
+                                margin: 1.5rem 0;"></div>
+                """, unsafe_allow_html=True)
+                
+                st.markdown("""
+                    <h4 style="color: #39ff14; 
+                               font-weight: 600; 
+                               margin-bottom: 1rem;">
+                        Greeks
+                    </h4>
+                """, unsafe_allow_html=True)
+                
+                # Styled Greeks metrics
+                greeks_html = f"""
+                <div style="display: grid; gap: 0.75rem;">
+                    <div style="background: rgba(255, 255, 255, 0.05);
+                                backdrop-filter: blur(10px);
+                                border: 1px solid rgba(255, 255, 255, 0.1);
+                                border-radius: 12px;
+                                padding: 1rem;
+                                transition: all 0.3s ease;">
+                        <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Delta (Δ)</div>
+                        <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">{greeks['delta']:.4f}</div>
+                        <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Price sensitivity</div>
+                    </div>
+                    <div style="background: rgba(255, 255, 255, 0.05);
+                                backdrop-filter: blur(10px);
+                                border: 1px solid rgba(255, 255, 255, 0.1);
+                                border-radius: 12px;
+                                padding: 1rem;">
+                        <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Gamma (Γ)</div>
+                        <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">{greeks['gamma']:.6f}</div>
+                        <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Delta sensitivity</div>
+                    </div>
+                    <div style="background: rgba(255, 255, 255, 0.05);
+                                backdrop-filter: blur(10px);
+                                border: 1px solid rgba(255, 255, 255, 0.1);
+                                border-radius: 12px;
+                                padding: 1rem;">
+                        <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Theta (Θ)</div>
+                        <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">${greeks['theta']:.4f}/day</div>
+                        <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Time decay</div>
+                    </div>
+                    <div style="background: rgba(255, 255, 255, 0.05);
+                                backdrop-filter: blur(10px);
+                                border: 1px solid rgba(255, 255, 255, 0.1);
+                                border-radius: 12px;
+                                padding: 1rem;">
+                        <div style="color: #b8b8a8; font-size: 0.85rem; margin-bottom: 0.3rem;">Vega (ν)</div>
+                        <div style="color: #39ff14; font-size: 1.3rem; font-weight: 700;">${greeks['vega']:.4f}/1%</div>
+                        <div style="color: #808070; font-size: 0.75rem; margin-top: 0.3rem;">Volatility sensitivity</div>
+                    </div>
                 </div>
-            </div>
-            """
-            st.markdown(greeks_html, unsafe_allow_html=True)
-            
+                """
+                st.markdown(greeks_html, unsafe_allow_html=True)
+                
+                st.markdown("""
+                    <div style="margin-top: 1rem; padding: 1rem; 
+                                background: rgba(18, 53, 19, 0.2);
+                                border-radius: 10px;
+                                border-left: 3px solid #39ff14;">
+                        <p style="color: #b8b8a8; font-size: 0.85rem; margin: 0;">
+                            <strong style="color: #39ff14;">Model:</strong> Black–Scholes (no dividends)<br>
+                            Rates & vol in decimals (e.g., 0.2 = 20%)
+                        </p>
+                    </div>
+                """, unsafe_allow_html=True)
+        
+        with colB:
             st.markdown("""
-                <div style="margin-top: 1rem; padding: 1rem; 
-                            background: rgba(18, 53, 19, 0.2);
-                            border-radius: 10px;
-                            border-left: 3px solid #39ff14;">
-                    <p style="color: #b8b8a8; font-size: 0.85rem; margin: 0;">
-                        <strong style="color: #39ff14;">Model:</strong> Black–Scholes (no dividends)<br>
-                        Rates & vol in decimals (e.g., 0.2 = 20%)
-                    </p>
-                </div>
+                <h3 style="color: #39ff14; 
+                           font-weight: 700; 
+                           text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
+                           margin-bottom: 1rem;">
+                    3D Surface Plot: Option Price (Buy/Sell Values)
+                </h3>
             """, unsafe_allow_html=True)
-    
-    with colB:
+            
+            if errors:
+                st.info("Fix the input errors to render the 3D surface.")
+            else:
+                # Surface trace (prices and axes) is cached on
+                # unchanged inputs; only the marker and layout are rebuilt per rerun
+                surface_trace = compute_surface_trace(min_spot, max_spot, min_vol, max_vol,
+                                                      spot_points, vol_points, K, T, r, is_call)
+                fig = go.Figure(data=[surface_trace])
+                
+                # Add current point marker
+                current_price = black_scholes_price(S0, K, T, sigma, r, is_call)
+                fig.add_trace(go.Scatter3d(
+                    x=[S0],
+                    y=[sigma],
+                    z=[current_price],
+                    mode='markers',
+                    marker=dict(
+                        size=10,
+                        color='red',
+                        symbol='diamond',
+                        line=dict(width=2, color='white')
+                    ),
+                    name='Current Position',
+                    hovertemplate=f"Current Spot: ${S0:.2f}<br>Current Vol: {sigma:.2%}<br>Current Price: ${current_price:.4f}<extra></extra>"
+                ))
+                
+                fig.update_layout(
+                    scene=dict(
+                        xaxis_title="Spot Price (S) [$]",
+                        yaxis_title="Volatility (σ) [%]",
+                        zaxis_title="Option Price [$]",
+                        camera=dict(
+                            eye=dict(x=1.5, y=1.5, z=1.2)
+                        ),
+                        aspectmode="manual",
+                        aspectratio=dict(x=1, y=1, z=0.7)
+                    ),
+                    height=700,
+                    margin={"l": 0, "r": 0, "t": 20, "b": 0},
+                    title=f"3D Surface: {option_type} Option Price Surface"
+                )
+                st.plotly_chart(fig, width="stretch")
+                
+                st.caption("Tip: Rotate, zoom, and pan the 3D surface to explore buy/sell values at different spot prices and volatilities.")
+
+if tab2.open:
+    with tab2:
         st.markdown("""
             <h3 style="color: #39ff14; 
                        font-weight: 700; 
                        text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
                        margin-bottom: 1rem;">
-                3D Surface Plot: Option Price (Buy/Sell Values)
+                Payoff Diagram: Profit/Loss at Expiration
             </h3>
         """, unsafe_allow_html=True)
         
         if errors:
-            st.info("Fix the input errors to render the 3D surface.")
+            st.info("Fix the input errors to render the payoff diagram.")
         else:
-            S_vals = np.linspace(min_spot, max_spot, spot_points)
-            vol_vals = np.linspace(min_vol, max_vol, vol_points)
+            # Calculate current option price
+            current_premium = black_scholes_price(S0, K, T, sigma, r, is_call)
             
-            # Create meshgrid for 3D surface
-            S_mesh, vol_mesh = np.meshgrid(S_vals, vol_vals)
+            # Create spot price range for payoff
+            payoff_range = max(max_spot, K * 2) - min(min_spot, K * 0.5)
+            S_payoff = np.linspace(max(1.0, K * 0.5), K * 2, 200)
             
-            # Calculate prices for all combinations
-            Z = np.zeros_like(S_mesh, dtype=float)
-            for i in range(len(vol_vals)):
-                for j in range(len(S_vals)):
-                    Z[i, j] = black_scholes_price(float(S_mesh[i, j]), float(K), float(T), 
-                                                  float(vol_mesh[i, j]), float(r), option_type)
+            # Intrinsic values, and the payoffs derived from them as whole arrays
+            intrinsic = calculate_payoff_vec(S_payoff, K, is_call)
+            payoffs_long = intrinsic - current_premium
+            payoffs_short = -payoffs_long  # Short position is opposite
             
-            # Create 3D surface plot
-            fig = go.Figure(
-                data=go.Surface(
-                    x=S_mesh,
-                    y=vol_mesh,
-                    z=Z,
-                    colorscale="Viridis",
-                    colorbar={"title": "Option Price ($)"},
-                    hovertemplate="Spot: $%{x:.2f}<br>Vol: %{y:.2%}<br>Price: $%{z:.4f}<extra></extra>",
-                )
+            # float32 copies for the traces only; the metrics below use the float64 arrays
+            S_plot, long_plot, short_plot, intrinsic_plot = (
+                a.astype(np.float32) for a in (S_payoff, payoffs_long, payoffs_short, intrinsic)
             )
             
-            # Add current point marker
-            current_price = black_scholes_price(S0, K, T, sigma, r, option_type)
-            fig.add_trace(go.Scatter3d(
-                x=[S0],
-                y=[sigma],
-                z=[current_price],
-                mode='markers',
-                marker=dict(
-                    size=10,
-                    color='red',
-                    symbol='diamond',
-                    line=dict(width=2, color='white')
-                ),
-                name='Current Position',
-                hovertemplate=f"Current Spot: ${S0:.2f}<br>Current Vol: {sigma:.2%}<br>Current Price: ${current_price:.4f}<extra></extra>"
+            fig = go.Figure()
+            
+            # Long position payoff
+            fig.add_trace(go.Scattergl(
+                x=S_plot,
+                y=long_plot,
+                mode='lines',
+                name=f'Long {option_type} (Buy)',
+                line=dict(color='#39ff14', width=3),
+                hovertemplate="Spot: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>"
+            ))
+            
+            # Short position payoff
+            fig.add_trace(go.Scattergl(
+                x=S_plot,
+                y=short_plot,
+                mode='lines',
+                name=f'Short {option_type} (Sell)',
+                line=dict(color='#ff3333', width=3, dash='dash'),
+                hovertemplate="Spot: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>"
+            ))
+            
+            # Intrinsic value line
+            fig.add_trace(go.Scattergl(
+                x=S_plot,
+                y=intrinsic_plot,
+                mode='lines',
+                name='Intrinsic Value',
+                line=dict(color='gray', width=2, dash='dot'),
+                hovertemplate="Spot: $%{x:.2f}<br>Intrinsic: $%{y:.2f}<extra></extra>"
             ))
             
+            # Break-even line
+            if is_call:
+                breakeven = K + current_premium
+            else:
+                breakeven = K - current_premium
+            
+            fig.add_vline(
+                x=breakeven,
+                line_dash="dash",
+                line_color="yellow",
+                annotation_text=f"Break-even: ${breakeven:.2f}",
+                annotation_position="top"
+            )
+            
+            # Strike line
+            fig.add_vline(
+                x=K,
+                line_dash="dot",
+                line_color="white",
+                annotation_text=f"Strike: ${K:.2f}",
+                annotation_position="bottom"
+            )
+            
+            # Current spot line
+            fig.add_vline(
+                x=S0,
+                line_dash="solid",
+                line_color="cyan",
+                annotation_text=f"Current Spot: ${S0:.2f}",
+                annotation_position="top"
+            )
+            
+            # Zero P&L line
+            fig.add_hline(y=0, line_dash="dot", line_color="white", opacity=0.5)
+            
             fig.update_layout(
-                scene=dict(
-                    xaxis_title="Spot Price (S) [$]",
-                    yaxis_title="Volatility (σ) [%]",
-                    zaxis_title="Option Price [$]",
-                    camera=dict(
-                        eye=dict(x=1.5, y=1.5, z=1.2)
-                    ),
-                    aspectmode="manual",
-                    aspectratio=dict(x=1, y=1, z=0.7)
-                ),
-                height=700,
-                margin={"l": 0, "r": 0, "t": 20, "b": 0},
-                title=f"3D Surface: {option_type} Option Price Surface"
+                xaxis_title="Spot Price at Expiration ($)",
+                yaxis_title="Profit/Loss ($)",
+                height=600,
+                hovermode='x unified',
+                legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='white'),
+                title=f"{option_type} Option Payoff Diagram (Premium: ${current_premium:.4f})"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(fig, width="stretch")
             
-            st.caption("Tip: Rotate, zoom, and pan the 3D surface to explore buy/sell values at different spot prices and volatilities.")
-
-with tab2:
-    st.markdown("""
-        <h3 style="color: #39ff14; 
-                   font-weight: 700; 
-                   text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
-                   margin-bottom: 1rem;">
-            Payoff Diagram: Profit/Loss at Expiration
-        </h3>
-    """, unsafe_allow_html=True)
-    
-    if errors:
-        st.info("Fix the input errors to render the payoff diagram.")
-    else:
-        # Calculate current option price
-        current_premium = black_scholes_price(S0, K, T, sigma, r, option_type)
-        
-        # Create spot price range for payoff
-        payoff_range = max(max_spot, K * 2) - min(min_spot, K * 0.5)
-        S_payoff = np.linspace(max(1.0, K * 0.5), K * 2, 200)
-        
-        # Calculate payoffs
-        payoffs_long = [calculate_payoff(s, K, option_type, current_premium) for s in S_payoff]
-        payoffs_short = [-p for p in payoffs_long]  # Short position is opposite
-        
-        # Intrinsic values
-        if option_type == "Call":
-            intrinsic = [max(s - K, 0) for s in S_payoff]
-        else:
-            intrinsic = [max(K - s, 0) for s in S_payoff]
-        
-        fig = go.Figure()
-        
-        # Long position payoff
-        fig.add_trace(go.Scatter(
-            x=S_payoff,
-            y=payoffs_long,
-            mode='lines',
-            name=f'Long {option_type} (Buy)',
-            line=dict(color='#39ff14', width=3),
-            hovertemplate="Spot: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>"
-        ))
-        
-        # Short position payoff
-        fig.add_trace(go.Scatter(
-            x=S_payoff,
-            y=payoffs_short,
-            mode='lines',
-            name=f'Short {option_type} (Sell)',
-            line=dict(color='#ff3333', width=3, dash='dash'),
-            hovertemplate="Spot: $%{x:.2f}<br>P&L: $%{y:.2f}<extra></extra>"
-        ))
-        
-        # Intrinsic value line
-        fig.add_trace(go.Scatter(
-            x=S_payoff,
-            y=intrinsic,
-            mode='lines',
-            name='Intrinsic Value',
-            line=dict(color='gray', width=2, dash='dot'),
-            hovertemplate="Spot: $%{x:.2f}<br>Intrinsic: $%{y:.2f}<extra></extra>"
-        ))
-        
-        # Break-even line
-        if option_type == "Call":
-            breakeven = K + current_premium
-        else:
-            breakeven = K - current_premium
-        
-        fig.add_vline(
-            x=breakeven,
-            line_dash="dash",
-            line_color="yellow",
-            annotation_text=f"Break-even: ${breakeven:.2f}",
-            annotation_position="top"
-        )
-        
-        # Strike line
-        fig.add_vline(
-            x=K,
-            line_dash="dot",
-            line_color="white",
-            annotation_text=f"Strike: ${K:.2f}",
-            annotation_position="bottom"
-        )
-        
-        # Current spot line
-        fig.add_vline(
-            x=S0,
-            line_dash="solid",
-            line_color="cyan",
-            annotation_text=f"Current Spot: ${S0:.2f}",
-            annotation_position="top"
-        )
-        
-        # Zero P&L line
-        fig.add_hline(y=0, line_dash="dot", line_color="white", opacity=0.5)
-        
-        fig.update_layout(
-            xaxis_title="Spot Price at Expiration ($)",
-            yaxis_title="Profit/Loss ($)",
-            height=600,
-            hovermode='x unified',
-            legend=dict(yanchor="top", y=0.99, xanchor="left", x=0.01),
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='white'),
-            title=f"{option_type} Option Payoff Diagram (Premium: ${current_premium:.4f})"
-        )
-        st.plotly_chart(fig, use_container_width=True)
-        
-        # Payoff metrics
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("Premium Paid", f"${current_premium:.4f}")
-        with col2:
-            st.metric("Break-even Price", f"${breakeven:.2f}")
-        with col3:
-            max_profit = max(payoffs_long) if option_type == "Call" else max(payoffs_long)
-            st.metric("Max Profit", f"${max_profit:.2f}")
-        with col4:
-            max_loss = min(payoffs_long)
-            st.metric("Max Loss", f"${max_loss:.2f}")
+            # Payoff metrics
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("Premium Paid", f"${current_premium:.4f}")
+            with col2:
+                st.metric("Break-even Price", f"${breakeven:.2f}")
+            with col3:
+                max_profit = payoffs_long.max()
+                st.metric("Max Profit", f"${max_profit:.2f}")
+            with col4:
+                max_loss = payoffs_long.min()
+                st.metric("Max Loss", f"${max_loss:.2f}")
 
-with tab3:
-    st.markdown("""
-        <h3 style="color: #39ff14; 
-                   font-weight: 700; 
-                   text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
-                   margin-bottom: 1rem;">
-            Greeks Sensitivity Analysis
-        </h3>
-    """, unsafe_allow_html=True)
-    
-    if errors:
-        st.info("Fix the input errors to render the Greeks analysis.")
-    else:
-        # Delta analysis
-        st.markdown("""
-            <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
-                Delta (Δ) - Price Sensitivity
-            </h4>
-        """, unsafe_allow_html=True)
-        S_delta = np.linspace(min_spot, max_spot, 100)
-        deltas = []
-        for s in S_delta:
-            g = calculate_greeks(s, K, T, sigma, r, option_type)
-            deltas.append(g['delta'])
-        
-        fig_delta = go.Figure()
-        fig_delta.add_trace(go.Scatter(
-            x=S_delta,
-            y=deltas,
-            mode='lines',
-            name='Delta',
-            line=dict(color='#39ff14', width=3),
-            hovertemplate="Spot: $%{x:.2f}<br>Delta: %{y:.4f}<extra></extra>"
-        ))
-        fig_delta.add_vline(x=S0, line_dash="dash", line_color="cyan", 
-                           annotation_text=f"Current: ${S0:.2f}")
-        fig_delta.update_layout(
-            xaxis_title="Spot Price ($)",
-            yaxis_title="Delta (Δ)",
-            height=300,
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig_delta, use_container_width=True)
-        
-        # Gamma analysis
+if tab3.open:
+    with tab3:
         st.markdown("""
-            <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
-                Gamma (Γ) - Delta Sensitivity
-            </h4>
+            <h3 style="color: #39ff14; 
+                       font-weight: 700; 
+                       text-shadow: 0 0 10px rgba(57, 255, 20, 0.5);
+                       margin-bottom: 1rem;">
+                Greeks Sensitivity Analysis
+            </h3>
         """, unsafe_allow_html=True)
-        gammas = []
-        for s in S_delta:
-            g = calculate_greeks(s, K, T, sigma, r, option_type)
-            gammas.append(g['gamma'])
-        
-        fig_gamma = go.Figure()
-        fig_gamma.add_trace(go.Scatter(
-            x=S_delta,
-            y=gammas,
-            mode='lines',
-            name='Gamma',
-            line=dict(color='#ff6b6b', width=3),
-            hovertemplate="Spot: $%{x:.2f}<br>Gamma: %{y:.6f}<extra></extra>"
-        ))
-        fig_gamma.add_vline(x=S0, line_dash="dash", line_color="cyan",
-                           annotation_text=f"Current: ${S0:.2f}")
-        fig_gamma.update_layout(
-            xaxis_title="Spot Price ($)",
-            yaxis_title="Gamma (Γ)",
-            height=300,
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig_gamma, use_container_width=True)
         
-        # Theta analysis (time decay)
-        st.markdown("""
-            <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
-                Theta (Θ) - Time Decay
-            </h4>
-        """, unsafe_allow_html=True)
-        if T > 0:
-            time_remaining = np.linspace(0.01, T * 1.5, 100)
-            thetas = []
-            for t in time_remaining:
-                g = calculate_greeks(S0, K, t, sigma, r, option_type)
-                thetas.append(g['theta'])
+        if errors:
+            st.info("Fix the input errors to render the Greeks analysis.")
+        else:
+            # Delta analysis
+            st.markdown("""
+                <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
+                    Delta (Δ) - Price Sensitivity
+                </h4>
+            """, unsafe_allow_html=True)
+            # Delta and Gamma share d1, so evaluate the spot sweep once
+            S_delta, g_S = compute_greek_curves_S(min_spot, max_spot, 100, K, T, sigma, r, is_call)
+            deltas = g_S['delta']
             
-            fig_theta = go.Figure()
-            fig_theta.add_trace(go.Scatter(
-                x=time_remaining * 365,  # Convert to days
-                y=thetas,
+            fig_delta = go.Figure()
+            fig_delta.add_trace(go.Scattergl(
+                x=S_delta,
+                y=deltas,
                 mode='lines',
-                name='Theta',
-                line=dict(color='#ffa500', width=3),
-                hovertemplate="Days Remaining: %{x:.1f}<br>Theta: $%{y:.4f}/day<extra></extra>"
+                name='Delta',
+                line=dict(color='#39ff14', width=3),
+                hovertemplate="Spot: $%{x:.2f}<br>Delta: %{y:.4f}<extra></extra>"
             ))
-            fig_theta.add_vline(x=T * 365, line_dash="dash", line_color="cyan",
-                               annotation_text=f"Current: {T*365:.1f} days")
-            fig_theta.update_layout(
-                xaxis_title="Days to Expiration",
-                yaxis_title="Theta (Θ) [$/day]",
+            fig_delta.add_vline(x=S0, line_dash="dash", line_color="cyan", 
+                               annotation_text=f"Current: ${S0:.2f}")
+            fig_delta.update_layout(
+                xaxis_title="Spot Price ($)",
+                yaxis_title="Delta (Δ)",
                 height=300,
                 hovermode='x unified'
             )
-            st.plotly_chart(fig_theta, use_container_width=True)
-        
-        # Vega analysis
-        st.markdown("""
-            <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
-                Vega (ν) - Volatility Sensitivity
-            </h4>
-        """, unsafe_allow_html=True)
-        vol_range = np.linspace(max(0.01, min_vol), max_vol, 100)
-        vegas = []
-        for v in vol_range:
-            g = calculate_greeks(S0, K, T, v, r, option_type)
-            vegas.append(g['vega'])
-        
-        fig_vega = go.Figure()
-        fig_vega.add_trace(go.Scatter(
-            x=vol_range * 100,  # Convert to percentage
-            y=vegas,
-            mode='lines',
-            name='Vega',
-            line=dict(color='#9b59b6', width=3),
-            hovertemplate="Volatility: %{x:.2f}%<br>Vega: $%{y:.4f}/1%<extra></extra>"
-        ))
-        fig_vega.add_vline(x=sigma * 100, line_dash="dash", line_color="cyan",
-                          annotation_text=f"Current: {sigma*100:.1f}%")
-        fig_vega.update_layout(
-            xaxis_title="Volatility (%)",
-            yaxis_title="Vega (ν) [$/1%]",
-            height=300,
-            hovermode='x unified'
-        )
-        st.plotly_chart(fig_vega, use_container_width=True)
-        
-        st.caption("Greeks show how option price changes with underlying parameters. Use these to understand risk exposure.")
+            st.plotly_chart(fig_delta, width="stretch")
+            
+            # Gamma analysis
+            st.markdown("""
+                <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
+                    Gamma (Γ) - Delta Sensitivity
+                </h4>
+            """, unsafe_allow_html=True)
+            gammas = g_S['gamma']
+            
+            fig_gamma = go.Figure()
+            fig_gamma.add_trace(go.Scattergl(
+                x=S_delta,
+                y=gammas,
+                mode='lines',
+                name='Gamma',
+                line=dict(color='#ff6b6b', width=3),
+                hovertemplate="Spot: $%{x:.2f}<br>Gamma: %{y:.6f}<extra></extra>"
+            ))
+            fig_gamma.add_vline(x=S0, line_dash="dash", line_color="cyan",
+                               annotation_text=f"Current: ${S0:.2f}")
+            fig_gamma.update_layout(
+                xaxis_title="Spot Price ($)",
+                yaxis_title="Gamma (Γ)",
+                height=300,
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig_gamma, width="stretch")
+            
+            # Theta analysis (time decay)
+            st.markdown("""
+                <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
+                    Theta (Θ) - Time Decay
+                </h4>
+            """, unsafe_allow_html=True)
+            if T > 0:
+                time_remaining, thetas = compute_theta_curve(T, S0, K, sigma, r, is_call)
+                
+                fig_theta = go.Figure()
+                fig_theta.add_trace(go.Scattergl(
+                    x=time_remaining * 365,  # Convert to days
+                    y=thetas,
+                    mode='lines',
+                    name='Theta',
+                    line=dict(color='#ffa500', width=3),
+                    hovertemplate="Days Remaining: %{x:.1f}<br>Theta: $%{y:.4f}/day<extra></extra>"
+                ))
+                fig_theta.add_vline(x=T * 365, line_dash="dash", line_color="cyan",
+                                   annotation_text=f"Current: {T*365:.1f} days")
+                fig_theta.update_layout(
+                    xaxis_title="Days to Expiration",
+                    yaxis_title="Theta (Θ) [$/day]",
+                    height=300,
+                    hovermode='x unified'
+                )
+                st.plotly_chart(fig_theta, width="stretch")
+            
+            # Vega analysis
+            st.markdown("""
+                <h4 style="color: #39ff14; font-weight: 600; margin-top: 1.5rem; margin-bottom: 0.5rem;">
+                    Vega (ν) - Volatility Sensitivity
+                </h4>
+            """, unsafe_allow_html=True)
+            vol_range, vegas = compute_vega_curve(max(0.01, min_vol), max_vol, 100, S0, K, T, r, is_call)
+            
+            fig_vega = go.Figure()
+            fig_vega.add_trace(go.Scattergl(
+                x=vol_range * 100,  # Convert to percentage
+                y=vegas,
+                mode='lines',
+                name='Vega',
+                line=dict(color='#9b59b6', width=3),
+                hovertemplate="Volatility: %{x:.2f}%<br>Vega: $%{y:.4f}/1%<extra></extra>"
+            ))
+            fig_vega.add_vline(x=sigma * 100, line_dash="dash", line_color="cyan",
+                              annotation_text=f"Current: {sigma*100:.1f}%")
+            fig_vega.update_layout(
+                xaxis_title="Volatility (%)",
+                yaxis_title="Vega (ν) [$/1%]",
+                height=300,
+                hovermode='x unified'
+            )
+            st.plotly_chart(fig_vega, width="stretch")
+            
+            st.caption("Greeks show how option price changes with underlying parameters. Use these to understand risk exposure.")
 
 # Footer
 st.markdown("""
@@ -0,0 +1,135 @@
+# bs_numba.py
+import math
+import os
+import numpy as np
+from numba import config, njit, prange, set_num_threads
+
+# prange kernels default to one thread per CPU in the machine; containers
+# and pinned processes often get fewer, and oversubscribing them only adds
+# contention, so size the pool from the CPUs this process may run on.
+# set_num_threads is per calling thread and Streamlit reruns the script on
+# fresh threads, so the wrappers below apply it on every call.
+if hasattr(os, "sched_getaffinity"):
+    NUM_THREADS = max(1, min(len(os.sched_getaffinity(0)), config.NUMBA_NUM_THREADS))
+else:
+    NUM_THREADS = config.NUMBA_NUM_THREADS
+
+# -----------------------------
+# Numba kernels
+# -----------------------------
+# Kept out of app.py: Streamlit re-executes the script on every rerun, which
+# would redefine (and re-dispatch) the jitted functions each time.
+
+@njit(inline="always", cache=True)
+def _norm_cdf(x):
+    """Exact standard normal CDF via math.erf"""
+    return 0.5 * (1.0 + math.erf(x * 0.7071067811865476))
+
+@njit(inline="always", cache=True)
+def _phi_and_PHI(x):
+    """
+    Normal PDF and CDF for kernels that need both (Greeks). The PDF reuses
+    one exp(-x^2/2); the CDF is the exact erf form, since Delta is printed
+    to 4 decimals.
+    """
+    phi = 0.3989422804014327 * math.exp(-0.5 * x * x)
+    return phi, _norm_cdf(x)
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _bs_surface(S_axis, sig_axis, K, w, T, sqrtT, disc, logK, rT, out):
+    """
+    Black-Scholes (no dividends) for T > 0 with out[i, j] priced at
+    (S_axis[i], sig_axis[j]). Grid-invariant terms (sqrtT, disc, logK, rT)
+    come in precomputed from the call site; w = +1 for Call, -1 for Put.
+    """
+    # Terms that depend only on sigma, computed once per column
+    n = sig_axis.shape[0]
+    v_sqrtT = np.empty(n)
+    half_v2T = np.empty(n)
+    for j in range(n):
+        # Zero vol is the sigma -> 0 limit, so clamp instead of branching
+        v = max(sig_axis[j], 1e-12)
+        v_sqrtT[j] = v * sqrtT
+        half_v2T[j] = 0.5 * v * v * T
+    for i in prange(S_axis.shape[0]):
+        s = S_axis[i]
+        # Only S varies along a row: one log per row instead of per cell
+        log_moneyness = math.log(s) - logK + rT
+        for j in range(n):
+            d1 = (log_moneyness + half_v2T[j]) / v_sqrtT[j]
+            d2 = d1 - v_sqrtT[j]
+            # Exact CDF: its error is scaled by S and K here, and the hover
+            # prints prices to 4 decimals
+            out[i, j] = w * (s * _norm_cdf(w * d1) - K * disc * _norm_cdf(w * d2))
+    return out
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _greeks_surface(S, sig, K, T, r, is_call, out_delta, out_gamma, out_theta, out_vega):
+    """Delta, Gamma, Theta (per day), Vega (per 1%) over 2D S/sigma meshes, written into the out arrays."""
+    if T <= 0.0:
+        out_delta.fill(0.0)
+        out_gamma.fill(0.0)
+        out_theta.fill(0.0)
+        out_vega.fill(0.0)
+        return
+    w = 1.0 if is_call else -1.0
+    sqrtT = math.sqrt(T)
+    disc = math.exp(-r * T)
+    logK = math.log(K)
+    rT = r * T
+    for i in prange(S.shape[0]):
+        for j in range(S.shape[1]):
+            s = S[i, j]
+            v = sig[i, j]
+            if v <= 0.0:
+                out_delta[i, j] = 0.0
+                out_gamma[i, j] = 0.0
+                out_theta[i, j] = 0.0
+                out_vega[i, j] = 0.0
+                continue
+            v_sqrtT = v * sqrtT
+            d1 = (math.log(s) - logK + rT + 0.5 * v * v * T) / v_sqrtT
+            d2 = d1 - v_sqrtT
+            pd1, nd1 = _phi_and_PHI(d1)
+            out_delta[i, j] = nd1 - 0.5 * (1.0 - w)
+            out_gamma[i, j] = pd1 / (s * v_sqrtT)
+            out_theta[i, j] = (-s * pd1 * v / (2.0 * sqrtT) - w * r * K * disc * _norm_cdf(w * d2)) / 365.0
+            out_vega[i, j] = s * pd1 * sqrtT / 100.0
+
+def bs_surface(S_axis: np.ndarray, sig_axis: np.ndarray, K: float, T: float, r: float,
+               is_call: int) -> np.ndarray:
+    """
+    Price the S x sigma grid spanned by the two axes with the parallel
+    kernel, keeping the input float dtype. out[i, j] is priced at
+    (S_axis[i], sig_axis[j]).
+    """
+    dtype = np.result_type(S_axis, sig_axis, np.float32)
+    S_axis = np.ascontiguousarray(S_axis, dtype=dtype)
+    sig_axis = np.ascontiguousarray(sig_axis, dtype=dtype)
+    w = 1.0 if is_call else -1.0
+    out = np.empty((S_axis.shape[0], sig_axis.shape[0]), dtype=dtype)
+    if T <= 0:
+        # Expired: intrinsic value
+        out[:] = np.maximum(w * (S_axis[:, np.newaxis] - K), 0.0)
+        return out
+    set_num_threads(NUM_THREADS)
+    return _bs_surface(S_axis, sig_axis, float(K), w, float(T),
+                       math.sqrt(T), math.exp(-r * T), math.log(K), r * T, out)
+
+GREEK_NAMES = ("delta", "gamma", "theta", "vega")
+
+def greeks_surface(S, sig, K: float, T: float, r: float, is_call: int) -> dict:
+    """
+    Delta, Gamma, Theta, Vega for every point of S and sig (1-D or 2-D,
+    broadcast against each other) from one parallel kernel pass.
+    Returns a dict of arrays shaped like the broadcast inputs.
+    """
+    S, sig = np.broadcast_arrays(np.asarray(S, dtype=np.float64), np.asarray(sig, dtype=np.float64))
+    shape = S.shape
+    S = np.ascontiguousarray(np.atleast_2d(S))
+    sig = np.ascontiguousarray(np.atleast_2d(sig))
+    out = {name: np.empty(S.shape, dtype=np.float64) for name in GREEK_NAMES}
+    set_num_threads(NUM_THREADS)
+    _greeks_surface(S, sig, float(K), float(T), float(r), int(is_call),
+                    *(out[name] for name in GREEK_NAMES))
+    return {name: arr.reshape(shape) for name, arr in out.items()}
@@ -0,0 +1,243 @@
+# pricing.py
+import math
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import ndtr
+
+from bs_numba import bs_surface, greeks_surface
+
+# Kept out of app.py so the lru_cache below survives Streamlit reruns,
+# which re-execute the script (and redefine its functions) on every
+# widget interaction.
+
+# -----------------------------
+# Math helpers
+# -----------------------------
+INV_SQRT_2 = 0.7071067811865476     # 1 / sqrt(2)
+INV_SQRT_2PI = 0.3989422804014327   # 1 / sqrt(2 * pi)
+
+def norm_cdf(x: float) -> float:
+    """Standard normal CDF for scalars; array code calls scipy.special.ndtr directly"""
+    return 0.5 * (1.0 + math.erf(x * INV_SQRT_2))
+
+def norm_pdf(x: float) -> float:
+    """Standard normal probability density function"""
+    return INV_SQRT_2PI * math.exp(-0.5 * x * x)
+
+# -----------------------------
+# Memoized scalar pricing
+# -----------------------------
+# Cache keys round inputs to 9 significant digits. Relative rather than
+# absolute rounding, so a tiny but positive T or sigma never collapses to 0
+# (which would switch to the expired / zero-vol branch); slider jitter and
+# tab switches still land on the same entry.
+_KEY_DIGITS = 9
+
+def _cache_key(S: float, K: float, T: float, sigma: float, r: float) -> tuple:
+    return tuple(float(f"{x:.{_KEY_DIGITS}g}") for x in (S, K, T, sigma, r))
+
+@lru_cache(maxsize=4096)
+def _bs_cached(S: float, K: float, T: float, sigma: float, r: float, is_call: int) -> float:
+    """
+    Black-Scholes (no dividends).
+    S: spot
+    K: strike
+    T: time to maturity in years
+    sigma: volatility (decimal, e.g. 0.2)
+    r: risk-free rate (decimal, e.g. 0.03)
+    is_call: 1 for a Call, 0 for a Put
+    """
+    # Sign flip instead of Call/Put branches: w = +1 for Call, -1 for Put
+    w = 2.0 * is_call - 1.0
+
+    if T <= 0:
+        # Expired: intrinsic value
+        return max(w * (S - K), 0.0)
+
+    if sigma <= 0:
+        # Zero vol: discounted intrinsic at expiry approximation
+        forward = S * math.exp(r * T)
+        return math.exp(-r * T) * max(w * (forward - K), 0.0)
+
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) / (sigma * math.sqrt(T))
+    d2 = d1 - sigma * math.sqrt(T)
+
+    return w * (S * norm_cdf(w * d1) - K * math.exp(-r * T) * norm_cdf(w * d2))
+
+def black_scholes_price(S: float, K: float, T: float, sigma: float, r: float, is_call: int) -> float:
+    """
+    Black-Scholes (no dividends), memoized on inputs rounded to 9 significant
+    digits so near-identical reruns hit the cache. See _bs_cached for the parameters.
+    """
+    return _bs_cached(*_cache_key(S, K, T, sigma, r), is_call)
+
+def black_scholes_price_vec(S, K, T, sigma, r, is_call: int) -> np.ndarray:
+    """
+    Vectorized Black-Scholes (no dividends) over NumPy arrays.
+    Inputs broadcast against each other, so a surface can be priced in one
+    pass, e.g. black_scholes_price_vec(S_mesh, K, T, vol_mesh, r, 1).
+    Edge cases match black_scholes_price.
+    """
+    S, K, T, sigma, r = (np.asarray(a, dtype=float) for a in (S, K, T, sigma, r))
+    w = 2.0 * is_call - 1.0
+
+    # Straight-line evaluation: zero vol is the sigma -> 0 limit of the live
+    # formula, so only clamp sigma and select the expired lanes at the end
+    sigma = np.maximum(sigma, 1e-12)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Hoisted: with scalar K/T/r these are single evaluations, and
+        # sigma * sqrtT is reused by d2 instead of being rebuilt per cell
+        sqrtT = np.sqrt(T)
+        logK = np.log(K)
+        disc = np.exp(-r * T)
+        sigma_sqrtT = sigma * sqrtT
+        d1 = (np.log(S) - logK + (r + 0.5 * sigma * sigma) * T) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        live = w * (S * ndtr(w * d1) - K * disc * ndtr(w * d2))
+    expired = np.maximum(w * (S - K), 0.0)
+
+    return np.where(T > 0, live, expired)
+
+def build_price_surface(S_axis: np.ndarray, sigma_axis: np.ndarray, K: float, T: float, r: float,
+                        is_call: int) -> np.ndarray:
+    """
+    Price every (S, sigma) pair of the two axes in one kernel call.
+    Returns a C-contiguous float32 array with Z[i, j] priced at
+    (S_axis[i], sigma_axis[j]), ready for go.Surface(z=Z). The surface is
+    only rendered (WebGL draws in float32), so single precision halves the
+    memory traffic and the payload sent to the browser.
+    """
+    S_axis = np.ascontiguousarray(S_axis, dtype=np.float32)
+    sigma_axis = np.ascontiguousarray(sigma_axis, dtype=np.float32)
+    return bs_surface(S_axis, sigma_axis, K, T, r, is_call)
+
+@lru_cache(maxsize=4096)
+def _greeks_cached(S: float, K: float, T: float, sigma: float, r: float, is_call: int) -> dict:
+    """Calculate option Greeks: Delta, Gamma, Theta, Vega"""
+    if T <= 0 or sigma <= 0:
+        return {"delta": 0.0, "gamma": 0.0, "theta": 0.0, "vega": 0.0}
+    
+    sqrtT = math.sqrt(T)
+    disc = math.exp(-r * T)
+    inv_sigma_sqrtT = 1.0 / (sigma * sqrtT)
+    d1 = (math.log(S / K) + (r + 0.5 * sigma * sigma) * T) * inv_sigma_sqrtT
+    d2 = d1 - sigma * sqrtT
+    pd1 = norm_pdf(d1)
+    
+    w = 2.0 * is_call - 1.0
+    
+    # Delta (N(d1) for a Call, N(d1) - 1 for a Put)
+    delta = norm_cdf(d1) - (1 - is_call)
+    
+    # Gamma (same for Call and Put)
+    gamma = pd1 * inv_sigma_sqrtT / S
+    
+    # Theta (per year, negative for time decay)
+    theta = (-S * pd1 * sigma / (2 * sqrtT) - w * r * K * disc * norm_cdf(w * d2)) / 365.0
+    
+    # Vega (same for Call and Put, per 1% vol change)
+    vega = S * pd1 * sqrtT / 100.0
+    
+    return {
+        "delta": delta,
+        "gamma": gamma,
+        "theta": theta,
+        "vega": vega
+    }
+
+def calculate_greeks(S: float, K: float, T: float, sigma: float, r: float, is_call: int) -> dict:
+    """Memoized Greeks; returns a copy so callers can't mutate the cached dict"""
+    return dict(_greeks_cached(*_cache_key(S, K, T, sigma, r), is_call))
+
+def compute_all_vec(S, K, T, sigma, r, is_call: int) -> dict:
+    """
+    Vectorized price plus Delta, Gamma, Theta, Vega from a single pass over
+    d1/d2 (the array counterpart of price_and_greeks). Inputs broadcast
+    against each other; edge cases match black_scholes_price and
+    calculate_greeks.
+    """
+    S, K, T, sigma, r = (np.asarray(a, dtype=float) for a in (S, K, T, sigma, r))
+    live = (T > 0) & (sigma > 0)
+    # Zero vol is the sigma -> 0 limit of the price, so clamp it there; the
+    # Greeks of those lanes are zeroed below like in calculate_greeks
+    sigma = np.maximum(sigma, 1e-12)
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        sqrtT = np.sqrt(T)
+        disc = np.exp(-r * T)
+        sigma_sqrtT = sigma * sqrtT
+        d1 = (np.log(S) - np.log(K) + (r + 0.5 * sigma * sigma) * T) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        pd1 = INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+        # N(-x) = 1 - N(x), so a Put is the Call formula with N(x) - 1 in place of N(x)
+        p = 1 - is_call
+        nd1 = ndtr(d1) - p
+        nd2 = ndtr(d2) - p
+        price = S * nd1 - K * disc * nd2
+        gamma = pd1 / (S * sigma_sqrtT)
+        theta = (-S * pd1 * sigma / (2 * sqrtT) - r * K * disc * nd2) / 365.0
+        vega = S * pd1 * sqrtT / 100.0
+
+    expired = np.maximum((2.0 * is_call - 1.0) * (S - K), 0.0)
+    return {
+        "price": np.where(T > 0, price, expired),
+        "delta": np.where(live, nd1, 0.0),
+        "gamma": np.where(live, gamma, 0.0),
+        "theta": np.where(live, theta, 0.0),
+        "vega": np.where(live, vega, 0.0)
+    }
+
+def calculate_greeks_vec(S, K, T, sigma, r, is_call: int) -> dict:
+    """
+    Vectorized Greeks over NumPy arrays: inputs broadcast against each other
+    and each Greek comes back as an array. Edge cases match calculate_greeks.
+    """
+    greeks = compute_all_vec(S, K, T, sigma, r, is_call)
+    del greeks["price"]
+    return greeks
+
+@lru_cache(maxsize=4096)
+def _price_and_greeks_cached(S: float, K: float, T: float, sigma: float, r: float, is_call: int) -> dict:
+    """Price plus Delta, Gamma, Theta, Vega from a single pass over d1/d2"""
+    if T <= 0 or sigma <= 0:
+        return {"price": black_scholes_price(S, K, T, sigma, r, is_call),
+                "delta": 0.0, "gamma": 0.0, "theta": 0.0, "vega": 0.0}
+    
+    sqrtT = math.sqrt(T)
+    log_SK = math.log(S / K)
+    disc = math.exp(-r * T)
+    d1 = (log_SK + (r + 0.5 * sigma * sigma) * T) / (sigma * sqrtT)
+    d2 = d1 - sigma * sqrtT
+    nd1 = norm_cdf(d1)
+    nd2 = norm_cdf(d2)
+    pd1 = norm_pdf(d1)
+    
+    # N(-x) = 1 - N(x), so a Put is the Call formula with N(x) - 1 in place of N(x)
+    p = 1 - is_call
+    price = S * (nd1 - p) - K * disc * (nd2 - p)
+    delta = nd1 - p
+    theta = (-S * pd1 * sigma / (2 * sqrtT) - r * K * disc * (nd2 - p)) / 365.0
+    
+    return {
+        "price": price,
+        "delta": delta,
+        "gamma": pd1 / (S * sigma * sqrtT),
+        "theta": theta,
+        "vega": S * pd1 * sqrtT / 100.0
+    }
+
+def price_and_greeks(S: float, K: float, T: float, sigma: float, r: float, is_call: int) -> dict:
+    """Memoized price and Greeks; returns a copy so callers can't mutate the cached dict"""
+    return dict(_price_and_greeks_cached(*_cache_key(S, K, T, sigma, r), is_call))
+
+def calculate_payoff(S: float, K: float, is_call: int, premium: float = 0.0) -> float:
+    """Calculate profit/loss at expiration"""
+    w = 2.0 * is_call - 1.0
+    return max(w * (S - K), 0.0) - premium
+
+def calculate_payoff_vec(S, K: float, is_call: int, premium: float = 0.0) -> np.ndarray:
+    """Profit/loss at expiration over an array of spot prices"""
+    S = np.asarray(S, dtype=float)
+    w = 2.0 * is_call - 1.0
+    return np.maximum(w * (S - K), 0.0) - premium